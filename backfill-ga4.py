@@ -1,22 +1,16 @@
 import argparse
+import concurrent.futures
+import contextlib
 import csv
 import datetime
+import functools
+import io
 import json
+import math
 import os
-import pickle
 import sys
 
-from google.analytics.data_v1beta import BetaAnalyticsDataClient, OrderBy
-from google.analytics.data_v1beta.types import (
-    DateRange,
-    Dimension,
-    Metric,
-    RunReportRequest,
-)
-from google.cloud import bigquery
-from google.cloud.exceptions import NotFound
-from google.oauth2 import service_account
-from google_auth_oauthlib.flow import Flow
+import orjson
 
 # Load configuration
 with open(".config.json", "r") as f:
@@ -37,42 +31,40 @@ valid_end_date = get_valid_end_date(config.get("FETCH_TO_DATE"))
 FETCH_TO_DATE = valid_end_date.strftime("%Y-%m-%d")
 
 
-# Function to check if an event exists in BigQuery
-def exists_in_bigquery(
-    event_name, event_date, event_count, channel_group, dataset_id, bq_client
-):
-    year = event_date[:4]
-    month = event_date[4:6]
-    table_id = f"{TABLE_PREFIX}{year}{month}01"
-    table_ref = bq_client.dataset(dataset_id).table(table_id)
-
-    try:
-        bq_client.get_table(table_ref)
-    except NotFound:
-        return False
-
-    params = [
-        bigquery.ScalarQueryParameter("event_name", "STRING", event_name),
-        bigquery.ScalarQueryParameter("event_date", "INTEGER", event_date),
-        bigquery.ScalarQueryParameter("event_count", "INTEGER", event_count),
-        bigquery.ScalarQueryParameter("channel_group", "STRING", channel_group),
-    ]
-
+# Function to load the keys of records already stored in BigQuery for a month
+def load_existing_keys(bq_client, dataset_id, year, month):
+    table_id = f"{bq_client.project}.{dataset_id}.{TABLE_PREFIX}"
+
+    if not table_exists:
+        return set()
+
+    # Keys are formatted like the GA4 response values so they can be compared directly
+    query = f"""
+        SELECT
+            Event_Name,
+            FORMAT_DATE('%Y%m%d', Event_Date) AS Event_Date,
+            CAST(Event_Count AS STRING) AS Event_Count,
+            Channel
+        FROM `{table_id}`
+        WHERE Event_Date >= @month_start
+            AND Event_Date < DATE_ADD(@month_start, INTERVAL 1 MONTH)
+            AND Event_Date BETWEEN @start_date AND @end_date
+        GROUP BY Event_Name, Event_Date, Event_Count, Channel
+    """
+    month_start = datetime.date(int(year), int(month), 1)
+
+    # Only the partitions of the fetched date range are scanned, so a --yesterday
+    # run reads a single day instead of the whole month
     job_config = bigquery.QueryJobConfig()
-    job_config.query_parameters = params
-
-    result = bq_client.query(query, job_config=job_config).result()
-    count = list(result)[0][0]
-
-    if count > 0:
-        print(f"..record already exists in BigQuery ({count})", flush=True)
-
-    return count > 0
-
+    job_config.query_parameters = [
+        bigquery.ScalarQueryParameter("month_start", "DATE", month_start),
+        bigquery.ScalarQueryParameter("start_date", "DATE", start_date),
+        bigquery.ScalarQueryParameter("end_date", "DATE", end_date),
+    ]
 
-def get_table_ref(year, month):
-    table_id = f"{TABLE_PREFIX}{year}{month}01"
-    return bq_client.dataset(DATASET_ID).table(table_id)
+    query_job = bq_client.query(query, job_config=job_config, retry=bq_retry)
+    result = query_job.result(retry=bq_retry)
+    return {(r.Event_Name, r.Event_Date, r.Event_Count, r.Channel) for r in result}
 
 
 # Configuration parameters
@@ -96,6 +88,9 @@ parser.add_argument(
 parser.add_argument(
     "--initial_fetch", action="store_true", help="Fetch data from a wide date range."
 )
+parser.add_argument(
+    "--no-csv", action="store_true", help="Skip writing the data to output.csv."
+)
 args = parser.parse_args()
 
 # Determine date range
@@ -126,6 +121,27 @@ print(
     flush=True,
 )
 
+# Google client libraries are slow to import, so they are only loaded once the
+# arguments are known to start a fetch
+from google.analytics.data_v1beta import BetaAnalyticsDataClient, OrderBy
+from google.analytics.data_v1beta.types import (
+    DateRange,
+    Dimension,
+    Metric,
+    RunReportRequest,
+)
+from google.api_core import retry
+from google.cloud import bigquery
+from google.cloud.exceptions import NotFound
+from google.oauth2 import service_account
+from google.oauth2.credentials import Credentials
+
+# Retry transient errors with a short backoff instead of the slower library defaults
+api_retry = retry.Retry(initial=0.5, maximum=8.0, multiplier=2.0, timeout=120.0)
+bq_retry = bigquery.DEFAULT_RETRY.with_delay(
+    initial=0.5, maximum=8.0, multiplier=2.0
+).with_timeout(120.0)
+
 # Authenticate with service account for BigQuery
 creds1 = service_account.Credentials.from_service_account_file(
     SERVICE_ACCOUNT_FILE,
@@ -136,11 +152,24 @@ creds1 = service_account.Credentials.from_service_account_file(
 )
 bq_client = bigquery.Client(credentials=creds1, project=creds1.project_id)
 
+# Dataset and table references, built once and reused for every request
+dataset_ref = bigquery.DatasetReference(bq_client.project, DATASET_ID)
+table_ref = dataset_ref.table(TABLE_PREFIX)
+
+# Whether the backfill table exists, looked up once instead of before each use
+try:
+    bq_client.get_table(table_ref, retry=bq_retry)
+    table_exists = True
+except NotFound:
+    table_exists = False
+
 # Authenticate for Analytics Data API
-if os.path.exists("token.pickle"):
-    with open("token.pickle", "rb") as token:
-        creds = pickle.load(token)
+if os.path.exists("token.json"):
+    with open("token.json", "r") as token:
+        creds = Credentials.from_authorized_user_info(json.load(token), SCOPES)
 else:
+    from google_auth_oauthlib.flow import Flow
+
     # Create the flow using the client secrets file
     flow = Flow.from_client_secrets_file(
         CLIENT_SECRET_FILE, scopes=SCOPES, redirect_uri="http://localhost:8080/"
@@ -156,33 +185,60 @@ else:
     creds = flow.credentials
 
     # Save the credentials for future use
-    with open("token.pickle", "wb") as token:
-        pickle.dump(creds, token)
+    with open("token.json", "w") as token:
+        token.write(creds.to_json())
 
 print("Authentication successful!")
 
 client = BetaAnalyticsDataClient(credentials=creds)
 
 
+# Concurrent page requests per report. Both reports are fetched at the same time,
+# so this keeps the total under GA4's limit of 10 concurrent requests per property.
+REPORT_PAGE_WORKERS = 4
+
+
 # Function to run report with pagination
 def run_report_with_pagination(client, request):
-    all_rows = []
-    offset = 0  # Initialize offset
     limit = 10000  # Set limit (maximum rows per request)
 
-    while True:
-        # Apply offset and limit to request
-        request.offset = offset
-        request.limit = limit
-
-        response = client.run_report(request)
-        all_rows.extend(response.rows)
-
-        # Check if there are more rows to fetch
-        if len(response.rows) == limit:
-            offset += limit  # Increase offset for the next iteration
-        else:
-            break  # No more rows left, exit loop
+    # The first page also reports the total number of rows
+    request.offset = 0
+    request.limit = limit
+    response = client.run_report(request, retry=api_retry)
+    all_rows = list(response.rows)
+
+    if len(response.rows) < limit:
+        return all_rows
+
+    if not response.row_count:
+        # Total unknown, fetch the remaining pages one after the other
+        offset = limit
+        while True:
+            request.offset = offset
+            response = client.run_report(request, retry=api_retry)
+            all_rows.extend(response.rows)
+
+            # Check if there are more rows to fetch
+            if len(response.rows) == limit:
+                offset += limit  # Increase offset for the next iteration
+            else:
+                break  # No more rows left, exit loop
+
+        return all_rows
+
+    # Fetch the remaining pages concurrently, keeping them in offset order
+    n_pages = math.ceil(response.row_count / limit)
+    page_requests = [
+        RunReportRequest(request, offset=limit * page, limit=limit)
+        for page in range(1, n_pages)
+    ]
+    run_report = functools.partial(client.run_report, retry=api_retry)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=REPORT_PAGE_WORKERS
+    ) as executor:
+        for page_response in executor.map(run_report, page_requests):
+            all_rows.extend(page_response.rows)
 
     return all_rows
 
@@ -196,8 +252,6 @@ request_active_users = RunReportRequest(
     order_bys=[OrderBy({"dimension": {"dimension_name": "date"}})],
 )
 
-active_users = run_report_with_pagination(client, request_active_users)
-
 request_events = RunReportRequest(
     property=f"properties/{PROPERTY_ID}",
     date_ranges=[DateRange(start_date=start_date, end_date=end_date)],
@@ -210,122 +264,172 @@ request_events = RunReportRequest(
     metrics=[Metric(name="eventCount")],
 )
 
-all_events = run_report_with_pagination(client, request_events)
+# Both reports are independent, so fetch them concurrently
+with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+    active_users_future = executor.submit(
+        run_report_with_pagination, client, request_active_users
+    )
+    events_future = executor.submit(run_report_with_pagination, client, request_events)
+    active_users = active_users_future.result()
+    all_events = events_future.result()
 
 # Process and write data to CSV
-rows_by_month = {}
+CSV_BATCH_SIZE = 10000  # Rows written to the CSV file per writerows call
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB file buffer
 
-with open("output.csv", "w", newline="", encoding="utf-8") as csvfile:
-    csv_writer = csv.writer(csvfile)
-    csv_writer.writerow(
-        [
-            "Event Name",
-            "Event Date",
-            "Event Count",
-            "Is Conversion",
-            "Channel",
-            "Event_Type",
-        ]
+rows_by_month = {}
+existing_keys_by_month = {}  # Lazily loaded BigQuery keys per (year, month)
+date_to_key_cache = {}  # (year, month) key per GA4 date string
+seen_row_keys = set()  # Full values of the rows collected so far
+csv_batch = []  # Rows waiting to be written to the CSV file
+rows_by_month_setdefault = rows_by_month.setdefault  # Bound once for the row loops
+
+# The CSV file is only opened when CSV output was requested
+if args.no_csv:
+    csv_file_context = contextlib.nullcontext()
+else:
+    csv_file_context = open(
+        "output.csv", "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE
     )
 
+with csv_file_context as csvfile:
+    if not args.no_csv:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(
+            [
+                "Event Name",
+                "Event Date",
+                "Event Count",
+                "Is Conversion",
+                "Channel",
+                "Event_Type",
+            ]
+        )
+
     # Processing active users data
     for row in active_users:
         event_name = "ct_active_users"
         is_conversion = None
-        event_date = row.dimension_values[0].value
-        channel_group = row.dimension_values[1].value
+        dimension_values = row.dimension_values
+        event_date = dimension_values[0].value
+        channel_group = dimension_values[1].value
         event_count = row.metric_values[0].value
         event_type = "Traffic"
 
-        csv_writer.writerow(
-            [
-                event_name,
-                event_date,
-                event_count,
-                is_conversion,
-                channel_group,
-                event_type,
-            ]
-        )
-
-        # Check for existing records in BigQuery
-        if not (
-            args.yesterday
-            and exists_in_bigquery(
-                event_name,
-                event_date,
-                event_count,
-                channel_group,
-                DATASET_ID,
-                bq_client,
-            )
-        ):
-            year, month = event_date[:4], event_date[4:6]
-            key = (year, month)
-            rows_by_month.setdefault(key, []).append(
-                {
-                    "Event_Name": event_name,
-                    "Event_Date": event_date,
-                    "Event_Count": event_count,
-                    "Is_Conversion": is_conversion,
-                    "Channel": channel_group,
-                    "Event_Type": event_type,
-                }
+        if not args.no_csv:
+            csv_batch.append(
+                [
+                    event_name,
+                    event_date,
+                    event_count,
+                    is_conversion,
+                    channel_group,
+                    event_type,
+                ]
             )
+            if len(csv_batch) >= CSV_BATCH_SIZE:
+                csv_writer.writerows(csv_batch)
+                csv_batch.clear()
 
-    # Sort and process events data
-    sorted_events = sorted(all_events, key=lambda x: x.dimension_values[1].value)
-    for row in sorted_events:
-        event_name = row.dimension_values[0].value
-        event_date = row.dimension_values[1].value
-        is_conversion = row.dimension_values[2].value
+        key = date_to_key_cache.get(event_date)
+        if key is None:
+            key = (event_date[:4], event_date[4:6])
+            date_to_key_cache[event_date] = key
 
-        if is_conversion == "(not set)":
-            is_conversion = ""
+        # Skip rows identical to one already collected in this run
+        row_key = (event_name, event_date, event_count, is_conversion, channel_group)
+        if row_key in seen_row_keys:
+            continue
+        seen_row_keys.add(row_key)
 
-        channel_group = row.dimension_values[3].value
-        event_count = row.metric_values[0].value
+        # Check for existing records in BigQuery
+        if args.yesterday:
+            record_key = (event_name, event_date, event_count, channel_group)
+            if key not in existing_keys_by_month:
+                existing_keys_by_month[key] = load_existing_keys(
+                    bq_client, DATASET_ID, *key
+                )
+            if record_key in existing_keys_by_month[key]:
+                print("..record already exists in BigQuery", flush=True)
+                continue
+
+        rows_by_month_setdefault(key, []).append(
+            {
+                "Event_Name": event_name,
+                "Event_Date": event_date,
+                "Event_Count": event_count,
+                "Is_Conversion": is_conversion,
+                "Channel": channel_group,
+                "Event_Type": event_type,
+            }
+        )
 
-        is_conversion = bool(is_conversion)
+    # Processing events data
+    for row in all_events:
+        dimension_values = row.dimension_values
+        event_name = dimension_values[0].value
+        event_date = dimension_values[1].value
+        # Empty and "(not set)" values both mean the event is not a conversion
+        is_conversion = dimension_values[2].value not in ("", "(not set)")
+        channel_group = dimension_values[3].value
+        event_count = row.metric_values[0].value
         event_type = "Conversion" if is_conversion else "Event"
 
-        csv_writer.writerow(
-            [
-                event_name,
-                event_date,
-                event_count,
-                is_conversion,
-                channel_group,
-                event_type,
-            ]
-        )
+        if not args.no_csv:
+            csv_batch.append(
+                [
+                    event_name,
+                    event_date,
+                    event_count,
+                    is_conversion,
+                    channel_group,
+                    event_type,
+                ]
+            )
+            if len(csv_batch) >= CSV_BATCH_SIZE:
+                csv_writer.writerows(csv_batch)
+                csv_batch.clear()
+
+        key = date_to_key_cache.get(event_date)
+        if key is None:
+            key = (event_date[:4], event_date[4:6])
+            date_to_key_cache[event_date] = key
+
+        # Skip rows identical to one already collected in this run
+        row_key = (event_name, event_date, event_count, is_conversion, channel_group)
+        if row_key in seen_row_keys:
+            continue
+        seen_row_keys.add(row_key)
 
         # Check for existing records in BigQuery
-        if not (
-            args.yesterday
-            and exists_in_bigquery(
-                event_name,
-                event_date,
-                event_count,
-                channel_group,
-                DATASET_ID,
-                bq_client,
-            )
-        ):
-            year, month = event_date[:4], event_date[4:6]
-            key = (year, month)
-            rows_by_month.setdefault(key, []).append(
-                {
-                    "Event_Name": event_name,
-                    "Event_Date": event_date,
-                    "Event_Count": event_count,
-                    "Is_Conversion": is_conversion,
-                    "Channel": channel_group,
-                    "Event_Type": event_type,
-                }
-            )
+        if args.yesterday:
+            record_key = (event_name, event_date, event_count, channel_group)
+            if key not in existing_keys_by_month:
+                existing_keys_by_month[key] = load_existing_keys(
+                    bq_client, DATASET_ID, *key
+                )
+            if record_key in existing_keys_by_month[key]:
+                print("..record already exists in BigQuery", flush=True)
+                continue
+
+        rows_by_month_setdefault(key, []).append(
+            {
+                "Event_Name": event_name,
+                "Event_Date": event_date,
+                "Event_Count": event_count,
+                "Is_Conversion": is_conversion,
+                "Channel": channel_group,
+                "Event_Type": event_type,
+            }
+        )
+
+    # Write the rows left over from the last batch
+    if not args.no_csv:
+        csv_writer.writerows(csv_batch)
+        csv_batch.clear()
 
-print("Data saved to output.csv!", flush=True)
+if not args.no_csv:
+    print("Data saved to output.csv!", flush=True)
 
 
 def create_or_update_table_with_partition_and_cluster(
@@ -367,39 +471,193 @@ def format_event_date(event_date):
     return f"{event_date[:4]}-{event_date[4:6]}-{event_date[6:]}"
 
 
+# Months with more rows than this are written through the Storage Write API
+STORAGE_WRITE_MIN_ROWS = 10000
+STORAGE_WRITE_REQUEST_BYTES = 5 * 1024 * 1024  # Serialized rows per append request
+UNIX_EPOCH = datetime.date(1970, 1, 1)
+
+
+# Function to write rows through one pending stream per month, committed together
+def write_rows_with_storage_api(rows_by_key):
+    # Only large months use the Storage Write API, so its modules are loaded here
+    from google.cloud import bigquery_storage_v1
+    from google.cloud.bigquery_storage_v1 import types as storage_types
+    from google.cloud.bigquery_storage_v1 import writer
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+    # Proto message matching the schema, used to encode the rows
+    FieldProto = descriptor_pb2.FieldDescriptorProto
+    row_descriptor_proto = descriptor_pb2.DescriptorProto(
+        name="BackfillRow",
+        field=[
+            FieldProto(name="Event_Name", number=1, type=FieldProto.TYPE_STRING),
+            FieldProto(name="Event_Date", number=2, type=FieldProto.TYPE_INT32),
+            FieldProto(name="Event_Count", number=3, type=FieldProto.TYPE_INT64),
+            FieldProto(name="Is_Conversion", number=4, type=FieldProto.TYPE_BOOL),
+            FieldProto(name="Channel", number=5, type=FieldProto.TYPE_STRING),
+            FieldProto(name="Event_Type", number=6, type=FieldProto.TYPE_STRING),
+        ],
+    )
+    row_descriptor_pool = descriptor_pool.DescriptorPool()
+    row_descriptor_pool.Add(
+        descriptor_pb2.FileDescriptorProto(
+            name="backfill_row.proto", message_type=[row_descriptor_proto]
+        )
+    )
+    BackfillRow = message_factory.GetMessageClass(
+        row_descriptor_pool.FindMessageTypeByName("BackfillRow")
+    )
+
+    def serialize_row(row):
+        # DATE columns are sent as the number of days since the Unix epoch
+        event_date = datetime.date.fromisoformat(row["Event_Date"])
+        return BackfillRow(
+            Event_Name=row["Event_Name"],
+            Event_Date=(event_date - UNIX_EPOCH).days,
+            Event_Count=int(row["Event_Count"]),
+            Is_Conversion=row["Is_Conversion"],
+            Channel=row["Channel"],
+            Event_Type=row["Event_Type"],
+        ).SerializeToString()
+
+    # Append rows to a new pending stream and finalize it
+    def append_rows_to_pending_stream(rows):
+        write_stream = write_client.create_write_stream(
+            parent=parent,
+            write_stream=storage_types.WriteStream(
+                type_=storage_types.WriteStream.Type.PENDING
+            ),
+            retry=api_retry,
+        )
+
+        # The schema only needs to be sent with the first request of the stream
+        request_template = storage_types.AppendRowsRequest(
+            write_stream=write_stream.name,
+            proto_rows=storage_types.AppendRowsRequest.ProtoData(
+                writer_schema=storage_types.ProtoSchema(
+                    proto_descriptor=row_descriptor_proto
+                )
+            ),
+        )
+        append_rows_stream = writer.AppendRowsStream(write_client, request_template)
+
+        def send(serialized_rows, offset):
+            request = storage_types.AppendRowsRequest(
+                offset=offset,
+                proto_rows=storage_types.AppendRowsRequest.ProtoData(
+                    rows=storage_types.ProtoRows(serialized_rows=serialized_rows)
+                ),
+            )
+            return append_rows_stream.send(request)
+
+        futures = []
+        serialized_rows = []
+        batch_bytes = 0
+        offset = 0
+        for row in rows:
+            serialized_row = serialize_row(row)
+            if (
+                serialized_rows
+                and batch_bytes + len(serialized_row) > STORAGE_WRITE_REQUEST_BYTES
+            ):
+                futures.append(send(serialized_rows, offset))
+                offset += len(serialized_rows)
+                serialized_rows = []
+                batch_bytes = 0
+            serialized_rows.append(serialized_row)
+            batch_bytes += len(serialized_row)
+        if serialized_rows:
+            futures.append(send(serialized_rows, offset))
+
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            append_rows_stream.close()
+
+        write_client.finalize_write_stream(name=write_stream.name, retry=api_retry)
+        return write_stream.name
+
+    write_client = bigquery_storage_v1.BigQueryWriteClient(credentials=creds1)
+    parent = write_client.table_path(
+        table_ref.project, table_ref.dataset_id, table_ref.table_id
+    )
+
+    # Months are independent until the commit, so their streams are written concurrently
+    max_workers = min(8, len(rows_by_key))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        stream_names = list(
+            executor.map(append_rows_to_pending_stream, rows_by_key.values())
+        )
+
+    commit_response = write_client.batch_commit_write_streams(
+        storage_types.BatchCommitWriteStreamsRequest(
+            parent=parent, write_streams=stream_names
+        ),
+        retry=api_retry,
+    )
+    return commit_response.stream_errors
+
+
 table_id = f"{bq_client.project}.{DATASET_ID}.{TABLE_PREFIX}"
 
-try:
-    bq_client.get_table(table_id)
+if table_exists:
     print(f"Table {table_id} already exists.")
-except NotFound:
+else:
     # If table does not exist, create it
     print(f"Table {table_id} not found. Creating table...")
-    table = bigquery.Table(table_id, schema=schema)
+    table = bigquery.Table(table_ref, schema=schema)
     table.time_partitioning = bigquery.TimePartitioning(
         field=config["PARTITION_BY"], type_=bigquery.TimePartitioningType.DAY
     )
     if "CLUSTER_BY" in config and config["CLUSTER_BY"]:
         table.clustering_fields = [config["CLUSTER_BY"]]
-    bq_client.create_table(table)
+    bq_client.create_table(table, retry=bq_retry)
+    table_exists = True
     print(f"Created table {table_id}")
 
 all_rows_to_insert = []
-for _, month_data in rows_by_month.items():
+storage_write_rows = {}
+for key, month_data in rows_by_month.items():
     for row in month_data:
         # Format the 'Event_Date' to match BigQuery DATE format 'YYYY-MM-DD'
         if "Event_Date" in row:
             row["Event_Date"] = format_event_date(row["Event_Date"])
-        all_rows_to_insert.append(row)
 
-# Now, insert all rows into the single table
-if all_rows_to_insert:
-    errors = bq_client.insert_rows_json(
-        table_id, all_rows_to_insert
-    )  # Use insert_rows_json for better performance with dicts
-    if errors:
-        print("Errors:", errors, flush=True)
+    # Large months go through the Storage Write API, the rest share one load job
+    if len(month_data) > STORAGE_WRITE_MIN_ROWS:
+        storage_write_rows[key] = month_data
     else:
+        all_rows_to_insert.extend(month_data)
+
+# A failure here leaves every pending stream uncommitted and still lets the load
+# job below write the remaining months
+if storage_write_rows:
+    try:
+        stream_errors = write_rows_with_storage_api(storage_write_rows)
+        if stream_errors:
+            print("Errors:", stream_errors, flush=True)
+        else:
+            print("Data saved to BigQuery with the Storage Write API!", flush=True)
+    except Exception as e:
+        print("Errors:", e, flush=True)
+
+# Now, load the remaining rows into the single table with one load job
+if all_rows_to_insert:
+    job_config = bigquery.LoadJobConfig(
+        schema=schema,
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+        source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+    )
+    # Serialize the rows to NDJSON with orjson rather than the stdlib encoder
+    ndjson_rows = b"\n".join(orjson.dumps(row) for row in all_rows_to_insert)
+    job = bq_client.load_table_from_file(
+        io.BytesIO(ndjson_rows), table_ref, job_config=job_config
+    )
+    try:
+        job.result(retry=bq_retry)
         print("Data saved to BigQuery!", flush=True)
-else:
+    except Exception as e:
+        print("Errors:", job.errors or e, flush=True)
+elif not storage_write_rows:
     print("No data to insert.")